@@ -97,7 +97,7 @@ fi
 
 # Install grape-recorder
 echo -e "${YELLOW}Installing grape-recorder...${NC}"
-"$INSTALL_DIR/venv/bin/pip" install -e "$SCRIPT_DIR[drf]" > /dev/null
+"$INSTALL_DIR/venv/bin/pip" install -e "$SCRIPT_DIR[all]" > /dev/null
 echo -e "${GREEN}✓ Installed grape-recorder${NC}"
 
 # Create log directory
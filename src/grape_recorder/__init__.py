@@ -19,18 +19,24 @@ GRAPE Recorder provides Phase 3 functionality:
 __version__ = "0.1.0"
 __author__ = "Michael James Hauan (AC0G)"
 
-from .core.decimation import StatefulDecimator
-from .core.decimation_pipeline import DecimationPipeline
-from .core.decimated_buffer import DecimatedBuffer
-from .core.carrier_spectrogram import CarrierSpectrogramGenerator
-from .core.phase3_product_engine import Phase3ProductEngine
-from .core.daily_drf_packager import DailyDRFPackager
-from .uploader import UploadManager
-from .upload_tracker import UploadTracker
+import importlib
+
+# Public names are resolved lazily (PEP 562) so that short-lived CLI
+# invocations don't pay for scipy/h5py/matplotlib/digital_rf at import time.
+_LAZY = {
+    'StatefulDecimator': '.core.decimation',
+    'DecimationPipeline': '.core.decimation_pipeline',
+    'DecimatedBuffer': '.core.decimated_buffer',
+    'CarrierSpectrogramGenerator': '.core.carrier_spectrogram',
+    'Phase3ProductEngine': '.core.phase3_product_engine',
+    'DailyDRFPackager': '.core.daily_drf_packager',
+    'UploadManager': '.uploader',
+    'UploadTracker': '.upload_tracker',
+}
 
 __all__ = [
     'StatefulDecimator',
-    'DecimationPipeline', 
+    'DecimationPipeline',
     'DecimatedBuffer',
     'CarrierSpectrogramGenerator',
     'Phase3ProductEngine',
@@ -38,3 +44,16 @@ __all__ = [
     'UploadManager',
     'UploadTracker',
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
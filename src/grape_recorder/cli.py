@@ -12,11 +12,13 @@ grape-upload        Upload to PSWS repository
 """
 
 import argparse
+import functools
 import logging
+import os
+import subprocess
 from pathlib import Path
 from datetime import datetime, date, timedelta
 import sys
-import shutil
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +35,7 @@ def setup_logging(verbose: bool = False):
         try:
             file_handler = logging.FileHandler(log_file)
             file_handler.setFormatter(logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             ))
             handlers.append(file_handler)
         except Exception as e:
@@ -43,52 +44,126 @@ def setup_logging(verbose: bool = False):
     logging.basicConfig(
         level=level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
         handlers=handlers
     )
 
 
-def main():
-    """Main entry point for grape-recorder."""
-    parser = argparse.ArgumentParser(
-        description='GRAPE Recorder - HF Time Signal Data Products'
-    )
-    parser.add_argument('-v', '--verbose', action='store_true',
-                        help='Enable verbose logging')
+def _ssh_option(value: str):
+    """argparse type for --ssh-option KEY=VALUE."""
+    key, sep, val = value.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {value!r}")
+    return key, val
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts/sizes that must be > 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {number}")
+    return number
+
+
+@functools.lru_cache(maxsize=None)
+def _build_subparsers():
+    """
+    Build the argument set for each command once.
     
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    The parsers are created with add_help=False so they can be used as
+    parents both for the grape-recorder subcommands and for the standalone
+    grape-* entry points.
+    
+    Returns:
+        Dict mapping command name to its parent ArgumentParser
+    """
+    parsers = {}
+    
+    def command(name):
+        p = argparse.ArgumentParser(add_help=False)
+        p.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
+        parsers[name] = p
+        return p
     
     # Decimate command
-    dec_parser = subparsers.add_parser('decimate', help='Decimate IQ (20/24 kHz) → 10 Hz')
-    dec_parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
+    dec_parser = command('decimate')
     dec_parser.add_argument('--channel', help='Channel name (e.g., "WWV 10 MHz")')
     dec_parser.add_argument('--date', help='Date to process (YYYY-MM-DD or YYYYMMDD)')
     dec_parser.add_argument('--all-channels', action='store_true',
                             help='Process all channels')
+    dec_parser.add_argument('--workers', type=int,
+                            help='Channels to decimate in parallel '
+                                 '(default: one per channel, up to the CPU count)')
+    dec_parser.add_argument('--keep-metadata', action='store_true',
+                            help='Skip raw metadata files; keep the timing/quality '
+                                 'already recorded (re-decimation of archived days)')
     
     # Spectrogram command
-    spec_parser = subparsers.add_parser('spectrogram', help='Generate spectrograms')
-    spec_parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
-    spec_parser.add_argument('--channel', help='Channel name')
+    spec_parser = command('spectrogram')
+    spec_parser.add_argument('--channel', required=True, help='Channel name')
     spec_parser.add_argument('--date', help='Date (YYYY-MM-DD or YYYYMMDD)')
     spec_parser.add_argument('--rolling', type=int, choices=[6, 12, 24],
                              help='Generate rolling spectrogram (hours)')
     spec_parser.add_argument('--grid', help='Receiver grid square for solar zenith')
     
     # Package DRF command
-    drf_parser = subparsers.add_parser('package-drf', help='Package Digital RF')
-    drf_parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
+    drf_parser = command('package-drf')
     drf_parser.add_argument('--date', required=True, help='Date to package')
     drf_parser.add_argument('--callsign', required=True, help='Station callsign')
     drf_parser.add_argument('--grid', required=True, help='Grid square')
     drf_parser.add_argument('--station-id', help='PSWS station ID')
     
     # Upload command
-    upload_parser = subparsers.add_parser('upload', help='Upload to PSWS')
-    upload_parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
+    upload_parser = command('upload')
     upload_parser.add_argument('--date', help='Date to upload (default: yesterday)')
     upload_parser.add_argument('--dry-run', action='store_true',
                                help='Show what would be uploaded')
+    upload_parser.add_argument('--concurrency', type=int, default=4,
+                               help='Number of datasets to upload in parallel, sharing the '
+                                    'configured bandwidth limit (default: 4)')
+    upload_parser.add_argument('--sftp-block-size', type=_positive_int, metavar='BYTES',
+                               help='SFTP request size in bytes (default and maximum: '
+                                    '261120; larger values are clamped)')
+    upload_parser.add_argument('--sftp-max-requests', type=int, metavar='N',
+                               help='Outstanding SFTP requests (default: 64)')
+    upload_parser.add_argument('--ssh-option', action='append', type=_ssh_option,
+                               default=[], metavar='KEY=VALUE',
+                               help='Extra ssh_config option for sftp/rsync (repeatable)')
+    
+    return parsers
+
+
+def _parse_command_args(command: str, description: str, args=None):
+    """Parse arguments for a standalone grape-* entry point."""
+    parser = argparse.ArgumentParser(
+        description=description,
+        parents=[_build_subparsers()[command]]
+    )
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Enable verbose logging')
+    return parser.parse_args(args)
+
+
+def main():
+    """Main entry point for grape-recorder."""
+    parser = argparse.ArgumentParser(
+        description='GRAPE Recorder - HF Time Signal Data Products'
+    )
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Enable verbose logging')
+    
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    parents = _build_subparsers()
+    subparsers.add_parser('decimate', parents=[parents['decimate']],
+                          help='Decimate IQ (20/24 kHz) → 10 Hz')
+    subparsers.add_parser('spectrogram', parents=[parents['spectrogram']],
+                          help='Generate spectrograms')
+    subparsers.add_parser('package-drf', parents=[parents['package-drf']],
+                          help='Package Digital RF')
+    subparsers.add_parser('upload', parents=[parents['upload']],
+                          help='Upload to PSWS')
     
     args = parser.parse_args()
     setup_logging(args.verbose)
@@ -108,16 +183,7 @@ def main():
 
 def decimate(args=None):
     """Entry point for grape-decimate command."""
-    parser = argparse.ArgumentParser(
-        description='Decimate 20/24 kHz IQ to 10 Hz'
-    )
-    parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
-    parser.add_argument('--channel', help='Channel name')
-    parser.add_argument('--date', help='Date (YYYY-MM-DD or YYYYMMDD)')
-    parser.add_argument('--all-channels', action='store_true')
-    parser.add_argument('-v', '--verbose', action='store_true')
-    
-    args = parser.parse_args(args)
+    args = _parse_command_args('decimate', 'Decimate 20/24 kHz IQ to 10 Hz', args)
     setup_logging(args.verbose)
     return decimate_cmd(args)
 
@@ -134,31 +200,22 @@ def decimate_cmd(args):
     if len(date_str) == 8:
         date_str = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
     
-    logger.info(f"Decimating data for {date_str}")
+    logger.info("Decimating data for %s", date_str)
     
     try:
-        pipeline = DecimationPipeline(data_root)
-        pipeline.process_day(date_str, channel=args.channel)
+        pipeline = DecimationPipeline(data_root, max_workers=args.workers)
+        pipeline.process_day(date_str, channel=args.channel,
+                             with_meta=not args.keep_metadata)
         logger.info("Decimation complete")
         return 0
     except Exception as e:
-        logger.error(f"Decimation failed: {e}", exc_info=True)
+        logger.error("Decimation failed: %s", e, exc_info=True)
         return 1
 
 
 def spectrogram(args=None):
     """Entry point for grape-spectrogram command."""
-    parser = argparse.ArgumentParser(
-        description='Generate carrier spectrograms'
-    )
-    parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
-    parser.add_argument('--channel', required=True, help='Channel name')
-    parser.add_argument('--date', help='Date (YYYY-MM-DD or YYYYMMDD)')
-    parser.add_argument('--rolling', type=int, choices=[6, 12, 24])
-    parser.add_argument('--grid', help='Receiver grid square')
-    parser.add_argument('-v', '--verbose', action='store_true')
-    
-    args = parser.parse_args(args)
+    args = _parse_command_args('spectrogram', 'Generate carrier spectrograms', args)
     setup_logging(args.verbose)
     return spectrogram_cmd(args)
 
@@ -176,13 +233,13 @@ def spectrogram_cmd(args):
     )
     
     if args.rolling:
-        logger.info(f"Generating {args.rolling}h rolling spectrogram")
+        logger.info("Generating %sh rolling spectrogram", args.rolling)
         gen.generate_rolling(hours=args.rolling)
     else:
         date_str = args.date or datetime.now().strftime('%Y%m%d')
         if '-' in date_str:
             date_str = date_str.replace('-', '')
-        logger.info(f"Generating daily spectrogram for {date_str}")
+        logger.info("Generating daily spectrogram for %s", date_str)
         gen.generate_daily(date_str)
     
     logger.info("Spectrogram generation complete")
@@ -191,17 +248,7 @@ def spectrogram_cmd(args):
 
 def package_drf(args=None):
     """Entry point for grape-package-drf command."""
-    parser = argparse.ArgumentParser(
-        description='Package Digital RF for PSWS upload'
-    )
-    parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
-    parser.add_argument('--date', required=True, help='Date to package')
-    parser.add_argument('--callsign', required=True, help='Station callsign')
-    parser.add_argument('--grid', required=True, help='Grid square')
-    parser.add_argument('--station-id', help='PSWS station ID')
-    parser.add_argument('-v', '--verbose', action='store_true')
-    
-    args = parser.parse_args(args)
+    args = _parse_command_args('package-drf', 'Package Digital RF for PSWS upload', args)
     setup_logging(args.verbose)
     return package_drf_cmd(args)
 
@@ -226,7 +273,7 @@ def package_drf_cmd(args):
         station_config=station_config
     )
     
-    logger.info(f"Packaging DRF for {date_str}")
+    logger.info("Packaging DRF for %s", date_str)
     packager.package_day(date_str)
     
     logger.info("DRF packaging complete")
@@ -235,20 +282,60 @@ def package_drf_cmd(args):
 
 def upload(args=None):
     """Entry point for grape-upload command."""
-    parser = argparse.ArgumentParser(
-        description='Upload to PSWS repository'
-    )
-    parser.add_argument('--data-root', default='/var/lib/timestd', help='Data root directory (default: /var/lib/timestd)')
-    parser.add_argument('--date', help='Date to upload (default: yesterday)')
-    parser.add_argument('--dry-run', action='store_true')
-    parser.add_argument('-v', '--verbose', action='store_true')
-    
-    args = parser.parse_args(args)
+    args = _parse_command_args('upload', 'Upload to PSWS repository', args)
     setup_logging(args.verbose)
     return upload_cmd(args)
 
 
 
+def _remove_dataset_contents(dataset_path: Path, keep: str):
+    """
+    Remove every entry in dataset_path except the one named keep.
+    
+    A Digital RF OBS directory can hold tens of thousands of small HDF5
+    files, so the bulk delete is handed to a single `rm -rf` rather than
+    walked file-by-file in Python. The Python walk is only used if `rm`
+    is unavailable or reports a failure.
+    """
+    with os.scandir(dataset_path) as it:
+        targets = [entry.path for entry in it if entry.name != keep]
+    if not targets:
+        return
+    
+    try:
+        result = subprocess.run(['rm', '-rf', '--', *targets],
+                                capture_output=True, text=True, check=False)
+        if result.returncode == 0:
+            return
+        logger.warning("rm -rf failed (%s), falling back to Python cleanup", result.stderr.strip())
+    except OSError as e:
+        logger.warning("rm unavailable (%s), falling back to Python cleanup", e)
+    
+    # One bottom-up walk per top-level directory (ch0/<hour>/rf@*.h5, ...),
+    # with a single try/except around the whole pass
+    try:
+        with os.scandir(dataset_path) as it:
+            for entry in it:
+                if entry.name == keep:
+                    continue
+                if not entry.is_dir(follow_symlinks=False):
+                    os.unlink(entry.path)
+                    continue
+                for root, dirs, files in os.walk(entry.path, topdown=False):
+                    for name in files:
+                        os.unlink(os.path.join(root, name))
+                    for name in dirs:
+                        path = os.path.join(root, name)
+                        # os.walk lists symlinked dirs here without descending
+                        if os.path.islink(path):
+                            os.unlink(path)
+                        else:
+                            os.rmdir(path)
+                os.rmdir(entry.path)
+    except OSError as e:
+        logger.warning("Failed to clean %s: %s", dataset_path, e)
+
+
 def cleanup_handler(task):
     """
     Cleanup handler called after successful upload.
@@ -256,22 +343,13 @@ def cleanup_handler(task):
     """
     try:
         dataset_path = Path(task.dataset_path)
-        logger.info(f"Cleanup: Processing {dataset_path}")
+        logger.info("Cleanup: Processing %s", dataset_path)
         
         # 1. Digital RF cleanup
         # Delete everything inside the OBS directory EXCEPT .upload_complete
-        if dataset_path.exists() and dataset_path.is_dir():
-            for item in dataset_path.iterdir():
-                if item.name == '.upload_complete':
-                    continue
-                try:
-                    if item.is_dir():
-                        shutil.rmtree(item)
-                    else:
-                        item.unlink()
-                except Exception as e:
-                    logger.warning(f"Failed to delete {item}: {e}")
-            logger.info(f"Cleanup: Digital RF data removed from {dataset_path.name}")
+        if dataset_path.is_dir():
+            _remove_dataset_contents(dataset_path, keep='.upload_complete')
+            logger.info("Cleanup: Digital RF data removed from %s", dataset_path.name)
             
         # 2. Decimated binary cleanup
         # Need date from metadata to find binary files
@@ -302,34 +380,39 @@ def cleanup_handler(task):
                 
                 if products_dir.exists():
                     cleaned_channels = 0
-                    for channel_dir in products_dir.iterdir():
-                        if not channel_dir.is_dir(): continue
-                        decimated_dir = channel_dir / 'decimated'
-                        if not decimated_dir.exists(): continue
-                        
-                        # Look for {DATE}.bin and {DATE}.json
-                        bin_file = decimated_dir / f"{date_str}.bin"
-                        json_file = decimated_dir / f"{date_str}.json"
-                        
-                        if bin_file.exists():
+                    # Look for {DATE}.bin and {DATE}.json in each channel's decimated/
+                    for bin_file in products_dir.glob(f"*/decimated/{date_str}.bin"):
+                        try:
                             bin_file.unlink()
                             cleaned_channels += 1
-                        if json_file.exists():
+                        except FileNotFoundError:
+                            pass
+                    for json_file in products_dir.glob(f"*/decimated/{date_str}.json"):
+                        try:
                             json_file.unlink()
+                        except FileNotFoundError:
+                            pass
                             
-                    logger.info(f"Cleanup: Removed decimated files for {cleaned_channels} channels")
+                    logger.info("Cleanup: Removed decimated files for %s channels", cleaned_channels)
                 else:
-                    logger.warning(f"Cleanup: Could not find products directory at {products_dir}")
+                    logger.warning("Cleanup: Could not find products directory at %s", products_dir)
             else:
                  logger.warning("Cleanup: Could not locate data root from dataset path")
                  
     except Exception as e:
-        logger.error(f"Cleanup handler failed: {e}", exc_info=True)
+        logger.error("Cleanup handler failed: %s", e, exc_info=True)
+
+
+def _scan_dirs(path):
+    """Yield os.DirEntry objects for the subdirectories of path."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield entry
 
 
 def upload_cmd(args):
     """Execute upload."""
-    import shutil # For cleanup handler
     from .uploader import UploadManager, load_upload_config_from_toml
     
     data_root = Path(args.data_root)
@@ -341,7 +424,7 @@ def upload_cmd(args):
         yesterday = date.today() - timedelta(days=1)
         date_str = yesterday.strftime('%Y-%m-%d')
     
-    logger.info(f"Uploading data for {date_str}")
+    logger.info("Uploading data for %s", date_str)
     
     if args.dry_run:
         logger.info("DRY RUN - no files will be uploaded")
@@ -366,12 +449,21 @@ def upload_cmd(args):
             
     toml_config = {}
     if config_path:
-        import toml
         try:
-            toml_config = toml.load(config_path)
-            logger.info(f"Loaded config from {config_path}")
+            import tomllib  # Python 3.11+
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                logger.error("tomli is required to read %s on Python < 3.11. "
+                             "Install with: pip install 'grape-recorder[upload]'", config_path)
+                return 1
+        try:
+            with open(config_path, 'rb') as f:
+                toml_config = tomllib.load(f)
+            logger.info("Loaded config from %s", config_path)
         except Exception as e:
-            logger.warning(f"Failed to load config from {config_path}: {e}")
+            logger.warning("Failed to load config from %s: %s", config_path, e)
     else:
         logger.debug("No configuration file found")
     
@@ -384,6 +476,11 @@ def upload_cmd(args):
             
         # Manually construct config for UploadManager
         upload_config = load_upload_config_from_toml(toml_config)
+        upload_config['ssh']['options'].update(args.ssh_option)
+        if args.sftp_block_size:
+            upload_config['sftp_block_size'] = args.sftp_block_size
+        if args.sftp_max_requests:
+            upload_config['sftp_max_requests'] = args.sftp_max_requests
         
         # Pass cleanup handler
         manager = UploadManager(
@@ -398,7 +495,7 @@ def upload_cmd(args):
         
         upload_dir = data_root / 'upload' / date_str
         if not upload_dir.exists():
-             logger.warning(f"No upload directory found at {upload_dir}")
+             logger.warning("No upload directory found at %s", upload_dir)
              # Check for legacy or alternative paths if needed
              return 0
              
@@ -407,34 +504,39 @@ def upload_cmd(args):
         # Enqueue the OBSERVATION directory (OBS...)
         
         enqueued_count = 0
-        for station_dir in upload_dir.iterdir():
-            if not station_dir.is_dir(): continue
-            for receiver_dir in station_dir.iterdir():
-                if not receiver_dir.is_dir(): continue
-                for obs_dir in receiver_dir.iterdir():
-                    if obs_dir.is_dir() and obs_dir.name.startswith('OBS'):
-                        # Found an observation directory
-                        
-                        # Metadata construction
-                        meta = {
-                            'date': date_str,
-                            'callsign': station_dir.name.split('_')[0],
-                            'grid_square': station_dir.name.split('_')[1] if '_' in station_dir.name else '',
-                            'station_id': receiver_dir.name.split('@')[1].split('_')[0] if '@' in receiver_dir.name else '',
-                            'instrument_id': receiver_dir.name.split('_')[-1] if '_' in receiver_dir.name else '1'
-                        }
-                        
-                        manager.enqueue(obs_dir, meta)
-                        enqueued_count += 1
+        for station_dir in _scan_dirs(upload_dir):
+            # Station/receiver fields are fixed for every OBS below them
+            callsign, _, rest = station_dir.name.partition('_')
+            grid_square = rest.partition('_')[0]
+            
+            for receiver_dir in _scan_dirs(station_dir.path):
+                receiver_name = receiver_dir.name
+                station_id = receiver_name.split('@', 2)[1].split('_', 1)[0] if '@' in receiver_name else ''
+                instrument_id = receiver_name.rpartition('_')[2] if '_' in receiver_name else '1'
+                
+                for obs_dir in _scan_dirs(receiver_dir.path):
+                    if not obs_dir.name.startswith('OBS'):
+                        continue
+                    
+                    meta = {
+                        'date': date_str,
+                        'callsign': callsign,
+                        'grid_square': grid_square,
+                        'station_id': station_id,
+                        'instrument_id': instrument_id
+                    }
+                    
+                    manager.enqueue(Path(obs_dir.path), meta)
+                    enqueued_count += 1
         
         if enqueued_count > 0:
-            logger.info(f"Enqueued {enqueued_count} datasets for upload")
-            manager.process_queue()
+            logger.info("Enqueued %s datasets for upload", enqueued_count)
+            manager.process_queue(max_workers=args.concurrency)
         else:
             logger.warning("No datasets found to enqueue")
 
     except Exception as e:
-        logger.error(f"Upload failed: {e}", exc_info=True)
+        logger.error("Upload failed: %s", e, exc_info=True)
         return 1
     
     logger.info("Upload complete")
@@ -8,15 +8,26 @@ Phase 3 data products pipeline:
 - PSWS upload preparation
 """
 
-from .decimation import StatefulDecimator, decimate_for_upload
-from .decimation_pipeline import DecimationPipeline
-from .decimated_buffer import DecimatedBuffer, MinuteMetadata, DayMetadata
-from .carrier_spectrogram import CarrierSpectrogramGenerator, SpectrogramConfig
-from .phase3_product_engine import Phase3ProductEngine
-from .phase3_products_service import Phase3ProductsService
-from .daily_drf_packager import DailyDRFPackager, StationConfig
-from .drf_batch_writer import DRFBatchWriter
-from .solar_zenith_calculator import calculate_solar_zenith_for_day
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562); see
+# grape_recorder/__init__.py.
+_LAZY = {
+    'StatefulDecimator': '.decimation',
+    'decimate_for_upload': '.decimation',
+    'DecimationPipeline': '.decimation_pipeline',
+    'DecimatedBuffer': '.decimated_buffer',
+    'MinuteMetadata': '.decimated_buffer',
+    'DayMetadata': '.decimated_buffer',
+    'CarrierSpectrogramGenerator': '.carrier_spectrogram',
+    'SpectrogramConfig': '.carrier_spectrogram',
+    'Phase3ProductEngine': '.phase3_product_engine',
+    'Phase3ProductsService': '.phase3_products_service',
+    'DailyDRFPackager': '.daily_drf_packager',
+    'StationConfig': '.daily_drf_packager',
+    'DRFBatchWriter': '.drf_batch_writer',
+    'calculate_solar_zenith_for_day': '.solar_zenith_calculator',
+}
 
 __all__ = [
     'StatefulDecimator',
@@ -33,3 +44,16 @@ __all__ = [
     'DRFBatchWriter',
     'calculate_solar_zenith_for_day',
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -19,6 +19,9 @@ Usage:
     buffer = DecimatedBuffer(data_root, channel_name)
     buffer.write_minute(minute_utc, decimated_iq, d_clock_ms, quality_grade, gap_info)
     
+    # Or a block of consecutive minutes at once (batch re-decimation)
+    buffer.write_minutes(first_minute_utc, block_of_600_sample_rows, meta_dicts)
+    
     # Reading (for spectrograms or DRF packaging)
     iq_data, metadata = buffer.read_day('2025-12-06')
     iq_data, metadata = buffer.read_hours(hours=6)  # Last 6 hours
@@ -194,11 +197,6 @@ class DecimatedBuffer:
         Returns:
             True if write succeeded
         """
-        # Determine date and minute index
-        dt = datetime.fromtimestamp(minute_utc, tz=timezone.utc)
-        date_str = dt.strftime('%Y%m%d')
-        minute_index = dt.hour * 60 + dt.minute
-        
         # Validate input
         if len(decimated_iq) != SAMPLES_PER_MINUTE:
             logger.warning(f"Expected {SAMPLES_PER_MINUTE} samples, got {len(decimated_iq)}")
@@ -210,7 +208,54 @@ class DecimatedBuffer:
             else:
                 decimated_iq = decimated_iq[:SAMPLES_PER_MINUTE]
         
-        decimated_iq = decimated_iq.astype(np.complex64)
+        return self.write_minutes(
+            minute_utc,
+            decimated_iq[np.newaxis, :],
+            [{
+                'd_clock_ms': d_clock_ms,
+                'uncertainty_ms': uncertainty_ms,
+                'quality_grade': quality_grade,
+                'gap_samples': gap_samples,
+            }]
+        )
+    
+    def write_minutes(
+        self,
+        minute_utc: float,
+        decimated_block: np.ndarray,
+        meta_block: List[Dict]
+    ) -> bool:
+        """
+        Write consecutive minutes of decimated data in one operation.
+        
+        One locked write for the samples and one metadata load/save for the
+        whole block, instead of one of each per minute.
+        
+        Args:
+            minute_utc: UTC timestamp of the first minute
+            decimated_block: Complex64 array of shape (n, 600), one row per minute
+            meta_block: n dicts with write_minute()'s fields (d_clock_ms,
+                        uncertainty_ms, quality_grade, gap_samples); missing
+                        keys take write_minute()'s defaults
+            
+        Returns:
+            True if write succeeded
+        """
+        # Determine date and first minute index
+        dt = datetime.fromtimestamp(minute_utc, tz=timezone.utc)
+        date_str = dt.strftime('%Y%m%d')
+        start_index = dt.hour * 60 + dt.minute
+        
+        block = np.ascontiguousarray(decimated_block, dtype=np.complex64)
+        num_minutes = len(block)
+        
+        if block.ndim != 2 or block.shape[1] != SAMPLES_PER_MINUTE or len(meta_block) != num_minutes:
+            logger.error(f"Bad minute block: shape {block.shape}, {len(meta_block)} metadata entries")
+            return False
+        
+        if start_index + num_minutes > 1440:
+            logger.error(f"Minute block {start_index}+{num_minutes} runs past the end of {date_str}")
+            return False
         
         bin_path, _ = self._get_paths(date_str)
         
@@ -220,34 +265,37 @@ class DecimatedBuffer:
                 self._create_day_file(bin_path)
             
             # Write at correct offset with file locking
-            byte_offset = minute_index * SAMPLES_PER_MINUTE * BYTES_PER_SAMPLE
+            byte_offset = start_index * SAMPLES_PER_MINUTE * BYTES_PER_SAMPLE
             
             with open(bin_path, 'r+b') as f:
                 fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                 try:
                     f.seek(byte_offset)
-                    f.write(decimated_iq.tobytes())
+                    f.write(block.tobytes())
                 finally:
                     fcntl.flock(f.fileno(), fcntl.LOCK_UN)
             
             # Update metadata
             metadata = self._load_metadata(date_str)
-            metadata.minutes[str(minute_index)] = MinuteMetadata(
-                minute_index=minute_index,
-                utc_timestamp=minute_utc,
-                d_clock_ms=d_clock_ms,
-                uncertainty_ms=uncertainty_ms,
-                quality_grade=quality_grade,
-                gap_samples=gap_samples,
-                valid=True
-            ).to_dict()
+            for i, meta in enumerate(meta_block):
+                minute_index = start_index + i
+                metadata.minutes[str(minute_index)] = MinuteMetadata(
+                    minute_index=minute_index,
+                    utc_timestamp=minute_utc + 60 * i,
+                    d_clock_ms=meta.get('d_clock_ms', 0.0),
+                    uncertainty_ms=meta.get('uncertainty_ms', 999.0),
+                    quality_grade=meta.get('quality_grade', 'X'),
+                    gap_samples=meta.get('gap_samples', 0),
+                    valid=True
+                ).to_dict()
             self._save_metadata(date_str, metadata)
             
-            logger.debug(f"Wrote minute {minute_index} for {date_str} ({self.channel_name})")
+            logger.debug(f"Wrote minutes {start_index}-{start_index + num_minutes - 1} "
+                        f"for {date_str} ({self.channel_name})")
             return True
             
         except Exception as e:
-            logger.error(f"Error writing minute {minute_index}: {e}")
+            logger.error(f"Error writing minutes {start_index}-{start_index + num_minutes - 1}: {e}")
             return False
     
     def _create_day_file(self, bin_path: Path):
@@ -376,6 +424,13 @@ class DecimatedBuffer:
             dates.append(date_str)
         return sorted(dates)
     
+    def get_minutes_metadata(self, date_str: str) -> Dict[str, Dict]:
+        """Get the stored per-minute metadata for a day, keyed by minute index."""
+        if '-' in date_str:
+            date_str = date_str.replace('-', '')
+        
+        return self._load_metadata(date_str).minutes
+    
     def get_day_summary(self, date_str: str) -> Optional[Dict]:
         """Get summary info for a day without loading all data."""
         if '-' in date_str:
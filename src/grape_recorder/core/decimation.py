@@ -184,13 +184,20 @@ REVISION HISTORY
 2025-10-15: Initial implementation with 3-stage pipeline
 """
 
+import importlib.util
 import numpy as np
 from scipy import signal
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List
 
 logger = logging.getLogger(__name__)
 
+# Optional compiled polyphase kernel. Only looked up here: numba itself is
+# imported (and the kernel compiled) on first use, see _get_numba_kernel()
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+_numba = None
+_numba_kernel = None
+
 # Supported input sample rates and their decimation parameters
 # All paths converge to 400 Hz intermediate rate, then final FIR decimates to 10 Hz
 # To add a new rate: ensure input_rate / cic_decimation = 400
@@ -593,19 +600,40 @@ def decimate_for_upload(iq_samples: np.ndarray, input_rate: int = 20000,
         return None
 
 
+def _cascade_factors(total_factor: int, max_factor: int = 13) -> List[int]:
+    """
+    Split a decimation factor into stages of at most max_factor.
+    
+    scipy.signal.decimate's default filters are only reliable for q <= 13
+    (the order-8 Chebyshev IIR becomes ill-conditioned above that), so large
+    factors are applied as a cascade, largest divisor first:
+        2400 -> [12, 10, 10, 2], 2000 -> [10, 10, 10, 2], 1600 -> [10, 10, 8, 2]
+    A prime factor above max_factor is kept as a single stage.
+    """
+    factors = []
+    remaining = total_factor
+    while remaining > 1:
+        q = next((d for d in range(min(max_factor, remaining), 1, -1) if remaining % d == 0),
+                 remaining)
+        factors.append(q)
+        remaining //= q
+    return factors
+
+
 def decimate_for_upload_simple(iq_samples: np.ndarray, input_rate: int = 20000,
                                output_rate: int = 10) -> Optional[np.ndarray]:
     """
     Simple fallback decimation using scipy.signal.decimate
     
-    Use this if the optimized version has issues.
-    - 24 kHz: Stages 10×10×24 = 2400
-    - 20 kHz: Stages 10×10×20 = 2000
-    - 16 kHz: Stages 10×10×16 = 1600
+    Use this if the optimized version has issues. The total factor is
+    applied in stages of at most 13 (see _cascade_factors):
+    - 24 kHz: Stages 12×10×10×2 = 2400
+    - 20 kHz: Stages 10×10×10×2 = 2000
+    - 16 kHz: Stages 10×10×8×2 = 1600
     
     Args:
         iq_samples: Complex IQ samples at input_rate
-        input_rate: Input sample rate (Hz) - 20000 or 16000
+        input_rate: Input sample rate (Hz) - 24000, 20000 or 16000
         output_rate: Output sample rate (Hz) - must be 10
         
     Returns:
@@ -625,27 +653,8 @@ def decimate_for_upload_simple(iq_samples: np.ndarray, input_rate: int = 20000,
         return None
     
     try:
-        # Stage 1: input → input/10 Hz (factor 10)
-        # 20000 → 2000 Hz or 16000 → 1600 Hz
-        if total_factor >= 10:
-            iq_samples = signal.decimate(iq_samples, q=10, ftype='iir', zero_phase=True)
-            total_factor //= 10
-        
-        # Stage 2: → /10 Hz (factor 10)
-        # 2000 → 200 Hz or 1600 → 160 Hz
-        if total_factor >= 10:
-            iq_samples = signal.decimate(iq_samples, q=10, ftype='iir', zero_phase=True)
-            total_factor //= 10
-        
-        # Stage 3: → 10 Hz (factor 20 for 20kHz, factor 16 for 16kHz)
-        # 200 → 10 Hz (factor 20) or 160 → 10 Hz (factor 16)
-        if total_factor >= 16:
-            iq_samples = signal.decimate(iq_samples, q=total_factor, ftype='iir', zero_phase=True)
-            total_factor = 1
-        
-        # Handle any remaining factor
-        if total_factor > 1:
-            iq_samples = signal.decimate(iq_samples, q=total_factor, ftype='iir', zero_phase=True)
+        for q in _cascade_factors(total_factor):
+            iq_samples = signal.decimate(iq_samples, q=q, ftype='iir', zero_phase=True)
         
         return iq_samples
         
@@ -654,6 +663,149 @@ def decimate_for_upload_simple(iq_samples: np.ndarray, input_rate: int = 20000,
         return None
 
 
+def _polyphase_numba(lanes, taps, factor, out):
+    """
+    Compiled equivalent of _PolyphaseDecimator's matrix product
+    (compiled with numba by _get_numba_kernel(); not called directly).
+    
+    Args:
+        lanes: float32 view of the complex64 input (re, im, re, im, ...)
+        taps: Flattened (P*R,) phase_taps
+        factor: Decimation factor R
+        out: (num_out, 2) float32 view of the complex64 output
+    """
+    num_taps = taps.shape[0]
+    for m in _numba.prange(out.shape[0]):
+        base = 2 * m * factor
+        acc_re = np.float32(0.0)
+        acc_im = np.float32(0.0)
+        for k in range(num_taps):
+            acc_re += taps[k] * lanes[base + 2 * k]
+            acc_im += taps[k] * lanes[base + 2 * k + 1]
+        out[m, 0] = acc_re
+        out[m, 1] = acc_im
+
+
+def _get_numba_kernel():
+    """Import numba and compile _polyphase_numba on first use."""
+    global _numba, _numba_kernel
+    if _numba_kernel is None:
+        import numba
+        _numba = numba
+        _numba_kernel = numba.njit(cache=True, fastmath=True, parallel=True,
+                                   boundscheck=False)(_polyphase_numba)
+    return _numba_kernel
+
+
+class _PolyphaseDecimator:
+    """
+    Streaming FIR filter + decimate-by-R that only computes kept outputs.
+    
+    Equivalent to lfilter(taps, [1.0], x, zi=...) followed by keeping every
+    R-th output (phase-aligned to the first sample ever processed), but the
+    filter is split into R polyphase branches so each output costs len(taps)
+    multiply-adds instead of every input sample costing len(taps).
+    
+    IMPLEMENTATION:
+    ---------------
+    The reversed taps are zero-padded to P*R and reshaped to (P, R):
+    
+        H[j, i] = h[P*R - 1 - (j*R + i)]
+    
+    Input is held in a pending buffer whose start is always the first
+    sample of the next output's window, so the input can be reshaped into
+    R-sample rows and each output is sum_j row[m + j] · H[j].
+    
+    The taps are real, so the complex64 rows are reinterpreted (no copy) as
+    float32 rows of interleaved re/im pairs, and all P phases are applied
+    in one real matrix product against a (2R, 2P) float32 matrix holding
+    each phase twice - once on the real lanes, once on the imaginary lanes.
+    The input is read once per call instead of once per phase.
+    """
+    
+    def __init__(self, taps: np.ndarray, factor: int):
+        self.factor = factor
+        self.num_phases = -(-len(taps) // factor)  # ceil
+        
+        padded = np.zeros(self.num_phases * factor)
+        padded[len(padded) - len(taps):] = np.asarray(taps)[::-1]
+        self.phase_taps = padded.reshape(self.num_phases, factor).astype(np.float32)
+        
+        # Column 2j (2j+1) applies phase j to the real (imaginary) lanes
+        self._lane_taps = np.zeros((2 * factor, 2 * self.num_phases), dtype=np.float32)
+        self._lane_taps[0::2, 0::2] = self.phase_taps.T
+        self._lane_taps[1::2, 1::2] = self.phase_taps.T
+        self._flat_taps = self.phase_taps.ravel()
+        
+        self.reset()
+    
+    def reset(self):
+        """Clear history (equivalent to zero initial filter state)."""
+        self.pending = np.zeros(self.num_phases * self.factor - 1, dtype=np.complex64)
+    
+    def _filter(self, buf: np.ndarray, acc: np.ndarray):
+        """Write len(acc) outputs for the windows starting at buf[0], buf[R], ..."""
+        R = self.factor
+        P = self.num_phases
+        num_out = len(acc)
+        
+        if USE_NUMBA_KERNEL and NUMBA_AVAILABLE:
+            _get_numba_kernel()(buf.view(np.float32), self._flat_taps, R, acc)
+        else:
+            num_rows = num_out + P - 1
+            lanes = buf[:num_rows * R].view(np.float32).reshape(num_rows, 2 * R)
+            
+            # phase_out[r, j] = row r filtered by phase j, as (re, im) float32
+            phase_out = (lanes @ self._lane_taps).reshape(num_rows, P, 2)
+            
+            acc[:] = phase_out[0:num_out, 0]
+            for j in range(1, P):
+                acc += phase_out[j:j + num_out, j]
+    
+    def process(self, samples: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Filter and decimate samples, carrying history across calls.
+        
+        If out (complex64) is large enough the results are written into it
+        and a view of it is returned; otherwise a new array is returned.
+        """
+        R = self.factor
+        span = self.num_phases * R
+        
+        samples = np.ascontiguousarray(samples, dtype=np.complex64)
+        held = len(self.pending)
+        total = held + len(samples)
+        num_out = (total - span) // R + 1 if total >= span else 0
+        
+        if num_out <= 0:
+            self.pending = np.concatenate((self.pending, samples))
+            return np.array([], dtype=np.complex64)
+        
+        if out is not None and len(out) >= num_out:
+            out = out[:num_out]
+        else:
+            out = np.empty(num_out, dtype=np.complex64)
+        acc = out.view(np.float32).reshape(num_out, 2)
+        
+        # Windows that start inside the held history are computed from a
+        # small joined head; the rest read samples in place, so the input
+        # is never copied whole
+        num_head = min(-(-held // R), num_out)
+        if num_head:
+            head_len = (num_head - 1) * R + span
+            head = np.concatenate((self.pending, samples[:head_len - held]))
+            self._filter(head, acc[:num_head])
+        if num_out > num_head:
+            self._filter(samples[num_head * R - held:], acc[num_head:])
+        
+        keep = total - num_out * R
+        if keep <= len(samples):
+            self.pending = samples[len(samples) - keep:].copy()
+        else:
+            self.pending = np.concatenate((self.pending[total - keep:], samples))
+        return out
+
+
 class StatefulDecimator:
     """
     Stateful decimator that preserves filter state across calls.
@@ -661,6 +813,13 @@ class StatefulDecimator:
     This eliminates the ~1 second filter transients at minute boundaries
     that cause visible artifacts in spectrograms.
     
+    Both decimating stages run as polyphase FIRs that only compute the
+    samples that survive decimation:
+        1. CIC (N cascaded boxcars, merged into one FIR) + ↓R → 400 Hz
+        2. Compensation FIR * final FIR (merged) + ↓40 → 10 Hz
+    The output is identical (to float32 precision) to filtering every
+    sample with lfilter and discarding the rest.
+    
     Usage:
         decimator = StatefulDecimator(input_rate=24000, output_rate=10)
         
@@ -717,36 +876,38 @@ class StatefulDecimator:
             stopband_attenuation_db=90
         )
         
-        # Initialize filter states
-        self.reset()
+        # N cascaded boxcars == one FIR of length N*(R-1)+1
+        cic_taps = self.cic_b
+        for _ in range(self.cic_order - 1):
+            cic_taps = np.convolve(cic_taps, self.cic_b)
+        
+        # Compensation (R=1) and final FIR are both linear at 400 Hz, so they
+        # collapse into one filter ahead of the ↓40
+        self._cic_stage = _PolyphaseDecimator(cic_taps, R)
+        self._final_stage = _PolyphaseDecimator(
+            np.convolve(self.comp_taps, self.final_taps), FINAL_FIR_DECIMATION
+        )
+        self._samples_in = 0
         
         logger.info(f"StatefulDecimator initialized: {input_rate} → {output_rate} Hz")
     
     def reset(self):
         """Reset all filter states (call at session/channel boundaries)."""
-        # CIC: N cascaded stages, each needs state
-        R = self.cic_params['decimation_factor']
-        self.cic_zi = [signal.lfilter_zi(self.cic_b, self.cic_a) * 0 
-                      for _ in range(self.cic_order)]
-        
-        # Compensation FIR state
-        self.comp_zi = signal.lfilter_zi(self.comp_taps, [1.0]) * 0
-        
-        # Final FIR state
-        self.final_zi = signal.lfilter_zi(self.final_taps, [1.0]) * 0
-        
-        # Track samples for decimation phase alignment
-        self.cic_sample_count = 0
-        self.final_sample_count = 0
+        self._cic_stage.reset()
+        self._final_stage.reset()
+        self._samples_in = 0
         
         logger.debug("Decimator state reset")
     
-    def process(self, iq_samples: np.ndarray) -> Optional[np.ndarray]:
+    def process(self, iq_samples: np.ndarray,
+                out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Process samples with preserved filter state.
         
         Args:
             iq_samples: Complex IQ samples at input_rate
+            out: Optional complex64 array for the result (like numpy's out=).
+                 Used when large enough; the return value is then a view of it.
             
         Returns:
             Decimated samples at output_rate
@@ -754,41 +915,60 @@ class StatefulDecimator:
         if len(iq_samples) == 0:
             return np.array([], dtype=np.complex64)
         
+        self._samples_in += len(iq_samples)
+        
         try:
-            # STAGE 1: CIC Filter with state preservation
-            R = self.cic_params['decimation_factor']
-            filtered = iq_samples
-            
-            for i in range(self.cic_order):
-                filtered, self.cic_zi[i] = signal.lfilter(
-                    self.cic_b, self.cic_a, filtered, zi=self.cic_zi[i]
-                )
-            
-            # Decimate with phase alignment
-            # Account for samples from previous calls
-            start_offset = (R - (self.cic_sample_count % R)) % R
-            self.cic_sample_count += len(filtered)
-            iq_400hz = filtered[start_offset::R]
+            # STAGE 1: CIC filter + decimate to 400 Hz
+            iq_400hz = self._cic_stage.process(iq_samples)
             
             if len(iq_400hz) == 0:
                 return np.array([], dtype=np.complex64)
             
-            # STAGE 2: Compensation FIR with state
-            iq_400hz_flat, self.comp_zi = signal.lfilter(
-                self.comp_taps, [1.0], iq_400hz, zi=self.comp_zi
-            )
+            # STAGES 2+3: Compensation + final FIR, decimate by 40
+            return self._final_stage.process(iq_400hz, out=out)
+            
+        except Exception as e:
+            logger.error(f"Stateful decimation failed: {e}")
+            return None
+    
+    def process_blocks(self, blocks: Iterable[np.ndarray],
+                       out: Optional[np.ndarray] = None) -> Optional[List[np.ndarray]]:
+        """
+        Process consecutive blocks (e.g. minutes) in one batch.
+        
+        Same output as calling process() on each block in turn, but the
+        400 Hz stage runs once over the whole batch. Blocks are consumed
+        one at a time, so each only has to stay valid until the next one
+        is requested (as with RawBinaryReader.read_day's reused buffer).
+        
+        Args:
+            blocks: Iterable of complex IQ arrays at input_rate
+            out: Optional complex64 array for the whole batch's output, as
+                 in process(); the returned arrays are then views of it
             
-            # STAGE 3: Final FIR + decimation with state
-            iq_filtered, self.final_zi = signal.lfilter(
-                self.final_taps, [1.0], iq_400hz_flat, zi=self.final_zi
-            )
+        Returns:
+            One decimated array per input block, or None on failure
+        """
+        q = self.cic_decimation * FINAL_FIR_DECIMATION
+        counts = []
+        iq_400hz = []
+        
+        try:
+            for block in blocks:
+                start = self._samples_in
+                self._samples_in += len(block)
+                
+                # After n input samples the two stages have emitted ceil(n / q)
+                counts.append(-(-self._samples_in // q) + (-start // q))
+                
+                if len(block) > 0:
+                    iq_400hz.append(self._cic_stage.process(block))
             
-            # Decimate by 40 with phase alignment
-            start_offset = (40 - (self.final_sample_count % 40)) % 40
-            self.final_sample_count += len(iq_filtered)
-            iq_10hz = iq_filtered[start_offset::40]
+            if not iq_400hz:
+                return [np.array([], dtype=np.complex64) for _ in counts]
             
-            return iq_10hz.astype(np.complex64)
+            decimated = self._final_stage.process(np.concatenate(iq_400hz), out=out)
+            return np.split(decimated, np.cumsum(counts)[:-1])
             
         except Exception as e:
             logger.error(f"Stateful decimation failed: {e}")
@@ -799,6 +979,12 @@ class StatefulDecimator:
 DECIMATION_FUNCTION = decimate_for_upload  # Use optimized version
 # DECIMATION_FUNCTION = decimate_for_upload_simple  # Uncomment for simple fallback
 
+# Run the polyphase stages through the numba kernel (requires numba).
+# Off by default: the numpy matrix product is as fast on a single core, and
+# the kernel's prange threads compete with DecimationPipeline's per-channel
+# worker processes. Worth enabling for serial runs on multi-core hosts.
+USE_NUMBA_KERNEL = False
+
 
 def get_supported_rates() -> Dict[int, Dict]:
     """
@@ -2,8 +2,11 @@
 Decimation Pipeline - Orchestrate reading, decimation, and storage
 """
 
+import itertools
 import logging
+import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -14,6 +17,58 @@ from .decimation import StatefulDecimator
 
 logger = logging.getLogger(__name__)
 
+# Minutes decimated per StatefulDecimator.process_blocks call
+MINUTES_PER_BATCH = 10
+
+# Most consecutive minutes written per DecimatedBuffer.write_minutes call
+MINUTES_PER_WRITE = 60
+
+
+def _take_samples(minutes, count, batch):
+    """Yield samples of the next `count` minutes, recording (ts, meta) in batch."""
+    for minute_ts, samples, meta in itertools.islice(minutes, count):
+        batch.append((minute_ts, meta))
+        yield samples
+
+
+class _MinuteBlockWriter:
+    """Collect consecutive decimated minutes and write them as one block."""
+    
+    def __init__(self, output_buffer: DecimatedBuffer, max_minutes: int = MINUTES_PER_WRITE):
+        self.output_buffer = output_buffer
+        self.block = np.zeros((max_minutes, SAMPLES_PER_MINUTE), dtype=np.complex64)
+        self.meta = []
+        self.start_ts = 0
+        self.minutes_written = 0
+    
+    def add(self, minute_ts: int, decimated: np.ndarray, meta: dict):
+        """Queue one minute; flushes first if it doesn't extend the current run."""
+        n = len(self.meta)
+        if n and (minute_ts != self.start_ts + 60 * n or n == len(self.block)
+                  or minute_ts % 86400 == 0):
+            self.flush()
+            n = 0
+        if n == 0:
+            self.start_ts = minute_ts
+        
+        row = self.block[n]
+        if len(decimated) != SAMPLES_PER_MINUTE:
+            # Pad or truncate
+            logger.warning(f"Expected {SAMPLES_PER_MINUTE} samples, got {len(decimated)}")
+            row[:] = 0
+        k = min(len(decimated), SAMPLES_PER_MINUTE)
+        row[:k] = decimated[:k]
+        self.meta.append(meta)
+    
+    def flush(self):
+        """Write the queued run of minutes."""
+        if not self.meta:
+            return
+        if self.output_buffer.write_minutes(float(self.start_ts), self.block[:len(self.meta)], self.meta):
+            self.minutes_written += len(self.meta)
+        self.meta = []
+
+
 class DecimationPipeline:
     """
     Pipeline to process raw high-rate station data into 10 Hz products.
@@ -24,47 +79,54 @@ class DecimationPipeline:
     3. Write to DecimatedBuffer (10 Hz, daily files)
     """
     
-    def __init__(self, data_root: Path):
+    def __init__(self, data_root: Path, max_workers: Optional[int] = None):
+        """
+        Args:
+            data_root: Root data directory
+            max_workers: Channels to decimate in parallel worker processes.
+                None uses min(channels, CPUs); 1 processes channels serially
+                in this process. Each worker holds about one raw minute
+                (~11 MB at 24 kHz) plus filter state.
+        """
         self.data_root = Path(data_root)
+        self.max_workers = max_workers
         
-    def process_day(self, date_str: str, channel: Optional[str] = None):
+    def process_day(self, date_str: str, channel: Optional[str] = None,
+                    with_meta: bool = True):
         """
         Process a full day of data.
         
         Args:
             date_str: Date to process (YYYYMMDD or YYYY-MM-DD)
             channel: Specific channel to process (None for all)
+            with_meta: Read raw per-minute metadata. False re-decimates the
+                samples only and keeps the timing/quality fields already
+                recorded in the decimated product (for re-runs over archived
+                days whose metadata has not changed).
         """
         # Normalize date
         if '-' in date_str:
             date_str = date_str.replace('-', '')
             
-        # Discover channels if not specified
-        channels_to_process = []
+        # Discover channels if not specified: channel name -> directory name
+        channels = {}
         if channel:
-            channels_to_process = [channel]
+            channels[channel] = channel.replace(' ', '_')
         else:
             # Look in raw_archive/raw_buffer for directories
             # We check both locations to be safe
             for subdir in ['raw_archive', 'raw_buffer']:
                 p = self.data_root / subdir
-                if p.exists():
-                    # hf-timestd uses underscores for directory names
-                    # We convert back to spaces for "channel names" if needed, 
-                    # but RawBinaryReader and DecimatedBuffer handle the mapping.
-                    # Best to stick to what the directories actually are.
-                    for d in p.iterdir():
-                        if d.is_dir():
-                            # Convert directory name back to channel name format if possible
-                            # e.g., WWV_10_MHz -> WWV 10 MHz
-                            # But DecimatedBuffer expects "WWV 10 MHz" and converts to "WWV_10_MHz"
-                            # So let's try to reverse map or just support directory names
-                            name = d.name.replace('_', ' ')
-                            if name not in channels_to_process:
-                                channels_to_process.append(name)
-        
-        # Deduplicate
-        channels_to_process = sorted(list(set(channels_to_process)))
+                try:
+                    with os.scandir(p) as entries:
+                        for d in entries:
+                            if d.is_dir():
+                                # hf-timestd uses underscores for directory names,
+                                # e.g. WWV_10_MHz for "WWV 10 MHz"
+                                channels[d.name.replace('_', ' ')] = d.name
+                except FileNotFoundError:
+                    continue
+        channels_to_process = sorted(channels)
         
         if not channels_to_process:
             logger.warning("No channels found to process")
@@ -72,17 +134,38 @@ class DecimationPipeline:
 
         logger.info(f"Processing {len(channels_to_process)} channels for {date_str}")
         
-        for ch in channels_to_process:
-            try:
-                self._process_channel_day(date_str, ch)
-            except Exception as e:
-                logger.error(f"Failed to process {ch}: {e}", exc_info=True)
+        max_workers = self.max_workers or min(len(channels_to_process), os.cpu_count() or 1)
+        
+        if max_workers <= 1 or len(channels_to_process) == 1:
+            for ch in channels_to_process:
+                try:
+                    self._process_channel_day(date_str, ch, with_meta, channels[ch])
+                except Exception as e:
+                    logger.error(f"Failed to process {ch}: {e}", exc_info=True)
+            return
+        
+        # Channels are independent (own reader, decimator and output file)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self._process_channel_day, date_str, ch, with_meta, channels[ch]): ch
+                for ch in channels_to_process
+            }
+            for future in as_completed(futures):
+                ch = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process {ch}: {e}", exc_info=True)
 
-    def _process_channel_day(self, date_str: str, channel_name: str):
-        """Process one channel for one day."""
+    def _process_channel_day(self, date_str: str, channel_name: str, with_meta: bool = True,
+                             dir_name: Optional[str] = None):
+        """Process one channel for one day (dir_name: raw channel directory, if known)."""
         logger.info(f"Starting {channel_name} for {date_str}")
         
-        reader = RawBinaryReader(self.data_root, channel_name)
+        if dir_name:
+            reader = RawBinaryReader.from_dir_name(self.data_root, dir_name)
+        else:
+            reader = RawBinaryReader(self.data_root, channel_name)
         output_buffer = DecimatedBuffer(self.data_root, channel_name)
         
         # Determine sample rate
@@ -92,65 +175,53 @@ class DecimationPipeline:
         # Initialize decimator
         decimator = StatefulDecimator(input_rate=input_rate, output_rate=10)
         
-        minutes_processed = 0
-        samples_generated = 0
-        gaps_detected = 0
+        writer = _MinuteBlockWriter(output_buffer)
+        
+        # Without raw metadata, carry over what was recorded last time so a
+        # re-decimation doesn't reset every minute's quality to defaults
+        stored_meta = None if with_meta else output_buffer.get_minutes_metadata(date_str)
+        
+        # Minutes with no input data are skipped: we can't "decimate" nothing,
+        # and DecimatedBuffer leaves minutes that are never written invalid.
+        # If a minute is missing entirely from the archive it never appears here.
+        minutes = (
+            (minute_ts, samples, meta)
+            for minute_ts, samples, meta in reader.read_day(date_str, with_meta=with_meta)
+            if samples is not None and len(samples) > 0
+        )
         
-        # Iterate over minutes
-        for minute_ts, samples, meta in reader.read_day(date_str):
-            decimated_chunk = None
-            gap_info = 0
+        # One output buffer per channel-day; each batch is written out
+        # before the next one overwrites it
+        batch_out = np.empty(MINUTES_PER_BATCH * SAMPLES_PER_MINUTE, dtype=np.complex64)
+        
+        while True:
+            batch = []
+            decimated = decimator.process_blocks(
+                _take_samples(minutes, MINUTES_PER_BATCH, batch), out=batch_out
+            )
+            if not batch:
+                break
+            if decimated is None:
+                continue
             
-            if samples is not None and len(samples) > 0:
-                # Process valid samples
-                decimated_chunk = decimator.process(samples)
+            for (minute_ts, meta), decimated_chunk in zip(batch, decimated):
+                if len(decimated_chunk) == 0:
+                    continue
                 
-                # Check for gaps in input
-                if meta and 'gap_samples' in meta:
-                    gap_info = meta['gap_samples']
-            else:
-                # Missing input data for this minute
-                # We should produce a gap minute (zeros or just flag it)
-                # StatefulDecimator.process([]) returns empty array
-                # But we need to maintain 10 Hz output continuity?
-                # DecimatedBuffer expects 600 samples for a valid minute
-                # If we have NO data, we can't really "decimate" it.
-                # However, to keep phase continuity, we might feed zeros to the filter?
-                # Feeding zeros to IIR can ring. 
-                # Better approach: Just skip writing valid=True for this minute 
-                # or write zeros. DecimatedBuffer handles "valid=False" implictly 
-                # if we don't call write_minute.
-                pass
-
-            if decimated_chunk is not None and len(decimated_chunk) > 0:
-                # Write to output
-                # We need minute_utc from timestamp
+                if stored_meta is not None:
+                    meta = stored_meta.get(str((minute_ts % 86400) // 60))
                 
                 # Metadata extraction
-                d_clock = 0.0
-                uncertainty = 999.9
-                grade = 'X'
-                
-                if meta:
-                    d_clock = meta.get('d_clock_ms', 0.0)
-                    uncertainty = meta.get('uncertainty_ms', 999.9)
-                    grade = meta.get('quality_grade', 'X')
-                
-                success = output_buffer.write_minute(
-                    minute_utc=float(minute_ts),
-                    decimated_iq=decimated_chunk,
-                    d_clock_ms=d_clock,
-                    uncertainty_ms=uncertainty,
-                    quality_grade=grade,
-                    gap_samples=gap_info
-                )
-                
-                if success:
-                    minutes_processed += 1
-                    samples_generated += len(decimated_chunk)
-            
-            # Handle gaps in output continuity?
-            # The reader yields available minutes. If a minute is missing entirely
-            # from the archive, we skip it here. DecimatedBuffer won't have it.
+                meta = meta or {}
+                writer.add(minute_ts, decimated_chunk, {
+                    'd_clock_ms': meta.get('d_clock_ms', 0.0),
+                    'uncertainty_ms': meta.get('uncertainty_ms', 999.9),
+                    'quality_grade': meta.get('quality_grade', 'X'),
+                    'gap_samples': meta.get('gap_samples', 0),
+                })
+        
+        writer.flush()
         
+        minutes_processed = writer.minutes_written
+        samples_generated = minutes_processed * SAMPLES_PER_MINUTE
         logger.info(f"  Completed {channel_name}: {minutes_processed} minutes, {samples_generated} samples")
@@ -5,12 +5,95 @@ Raw Binary Reader - Read raw station data from hf-timestd archive
 import numpy as np
 import logging
 import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Tuple, Generator
 
 logger = logging.getLogger(__name__)
 
+# Optional fast JSON parser
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Decompressors for .bin.zst / .bin.lz4 (None if not installed)
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+try:
+    import lz4.frame as _lz4_frame
+except ImportError:
+    _lz4_frame = None
+
+DEFAULT_SAMPLE_RATE = 24000
+STREAM_CHUNK_BYTES = 1 << 20  # 1 MiB compressed reads
+
+# Raw minute file suffixes, in the order read_minute tries them
+RAW_SUFFIXES = ('.bin', '.bin.zst', '.bin.lz4')
+
+# <unix timestamp>.bin[.zst|.lz4]
+_FNAME_RE = re.compile(r'^(\d{9,12})\.bin(?:\.zst|\.lz4)?$')
+
+# Access-pattern hints for the kernel page cache (Linux/POSIX only)
+HAVE_FADVISE = hasattr(os, 'posix_fadvise')
+
+# Consolidated per-day metadata: one {"minute": ts, "meta": {...}} per line
+DAY_META_FILE = 'meta.jsonl'
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _advise_sequential(f):
+    """Tell the kernel an open file will be read front to back (larger readahead)."""
+    if HAVE_FADVISE:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _readinto_samples(stream, out: np.ndarray) -> np.ndarray:
+    """
+    Fill a complex64 buffer from a binary stream via readinto().
+    
+    Returns the filled portion of out as a view. If the stream holds more
+    than out can take, the remainder is appended (one extra allocation).
+    """
+    raw = out.view(np.uint8)
+    pos = 0
+    while pos < len(raw):
+        n = stream.readinto(raw[pos:])
+        if not n:
+            break
+        pos += n
+    
+    if pos == len(raw):
+        extra = stream.read()
+        if extra:
+            return np.concatenate((out, np.frombuffer(extra, dtype=np.complex64)))
+    
+    return raw[:pos].view(np.complex64)
+
+
 class RawBinaryReader:
     """
     Reader for hf-timestd raw binary archive files.
@@ -19,20 +102,32 @@ class RawBinaryReader:
     Supports .bin (raw), .bin.zst (zstd compressed), and .bin.lz4 (lz4 compressed).
     """
     
-    def __init__(self, data_root: Path, channel_name: str):
+    def __init__(self, data_root: Path, channel_name: str, dir_name: Optional[str] = None):
         """
         Initialize reader.
         
         Args:
             data_root: Root data directory (containing raw_archive/)
             channel_name: Channel name (e.g., "WWV 10 MHz")
+            dir_name: On-disk channel directory, if already known
+                      (default: derived from channel_name)
         """
         self.data_root = Path(data_root)
         self.channel_name = channel_name
         
+        # Sizes decompression buffers; updated by get_sample_rate()
+        self.samples_per_minute = DEFAULT_SAMPLE_RATE * 60
+        self._zstd_dctx = None
+        
+        # Per-date caches (date_str -> value); a reader is used for one pass
+        # over finished days, so directory contents are not re-checked
+        self._minutes_cache: Dict[str, Tuple[int, ...]] = {}
+        self._rate_cache: Dict[str, int] = {}
+        self._day_meta: Dict[str, Optional[Dict[int, Dict]]] = {}
+        
         # Resolve channel directory
         # hf-timestd converts "WWV 10 MHz" -> "WWV_10_MHz"
-        self.channel_dir_name = channel_name.replace(' ', '_')
+        self.channel_dir_name = dir_name or channel_name.replace(' ', '_')
         
         # Check raw_archive first (Phase 1 storage)
         self.archive_dir = self.data_root / 'raw_archive' / self.channel_dir_name
@@ -44,6 +139,16 @@ class RawBinaryReader:
             
         logger.debug(f"RawBinaryReader initialized for {channel_name} at {self.archive_dir}")
 
+    @classmethod
+    def from_dir_name(cls, data_root: Path, dir_name: str) -> 'RawBinaryReader':
+        """
+        Create a reader for an on-disk channel directory (e.g. "WWV_10_MHz").
+        
+        The directory name is used verbatim for paths rather than being
+        round-tripped through the display name.
+        """
+        return cls(data_root, dir_name.replace('_', ' '), dir_name=dir_name)
+
     def get_available_minutes(self, date_str: str) -> List[int]:
         """
         Get list of available minute timestamps for a date.
@@ -56,54 +161,68 @@ class RawBinaryReader:
         """
         if '-' in date_str:
             date_str = date_str.replace('-', '')
+        
+        cached = self._minutes_cache.get(date_str)
+        if cached is not None:
+            return list(cached)
             
         day_dir = self.archive_dir / date_str
-        if not day_dir.exists():
+        minutes = set()
+        
+        # Scan for binary files (scandir: names only, no per-entry stat)
+        try:
+            with os.scandir(day_dir) as entries:
+                for entry in entries:
+                    # Handle .bin, .bin.zst, .bin.lz4; anything else doesn't match
+                    m = _FNAME_RE.match(entry.name)
+                    if m:
+                        minutes.add(int(m.group(1)))
+        except FileNotFoundError:
             logger.warning(f"No data directory for {date_str} at {day_dir}")
             return []
-            
-        minutes = set()
-        # Scan for binary files
-        for f in day_dir.glob('*.bin*'):
-            try:
-                # Handle .bin, .bin.zst, .bin.lz4
-                name = f.name
-                if '.bin' in name:
-                    stem = name.split('.bin')[0]
-                    # Check if stem is integer timestamp
-                    if stem.isdigit():
-                        minutes.add(int(stem))
-            except Exception:
-                continue
-                
-        return sorted(list(minutes))
+        
+        self._minutes_cache[date_str] = tuple(sorted(minutes))
+        return list(self._minutes_cache[date_str])
 
-    def read_minute(self, minute_timestamp: int) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
+    def read_minute(self, minute_timestamp: int,
+                    out: Optional[np.ndarray] = None,
+                    with_meta: bool = True,
+                    date_str: Optional[str] = None) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
         """
         Read IQ samples and metadata for a specific minute.
         
         Args:
             minute_timestamp: Unix timestamp of the minute start
+            out: Optional complex64 buffer to read into. The returned samples
+                 are then a view of it (unless the file is larger than out).
+            with_meta: Read the minute's metadata (False returns None for it)
+            date_str: The minute's UTC date (YYYYMMDD), if the caller knows it;
+                      skips deriving it from the timestamp
             
         Returns:
             Tuple of (samples, metadata)
             samples: complex64 numpy array or None
             metadata: dict or None
         """
-        dt = datetime.fromtimestamp(minute_timestamp, tz=timezone.utc)
-        date_str = dt.strftime('%Y%m%d')
+        if date_str is None:
+            dt = datetime.fromtimestamp(minute_timestamp, tz=timezone.utc)
+            date_str = dt.strftime('%Y%m%d')
         day_dir = self.archive_dir / date_str
         base_name = str(minute_timestamp)
         
         # 1. Try to read samples
         samples = None
+        if out is None:
+            out = np.empty(self.samples_per_minute, dtype=np.complex64)
         
         # Try uncompressed .bin
         bin_path = day_dir / f"{base_name}.bin"
         if bin_path.exists():
             try:
-                # Use memmap for efficiency with uncompressed files
-                samples = np.memmap(bin_path, dtype=np.complex64, mode='r')
+                # Unbuffered: readinto() is a single read(2) into out
+                with open(bin_path, 'rb', buffering=0) as f:
+                    _advise_sequential(f)
+                    samples = _readinto_samples(f, out)
             except Exception as e:
                 logger.error(f"Error reading {bin_path}: {e}")
 
@@ -111,71 +230,280 @@ class RawBinaryReader:
         if samples is None:
             zst_path = day_dir / f"{base_name}.bin.zst"
             if zst_path.exists():
-                try:
-                    import zstandard as zstd
-                    with open(zst_path, 'rb') as f:
-                        dctx = zstd.ZstdDecompressor()
-                        data = dctx.decompress(f.read())
-                        samples = np.frombuffer(data, dtype=np.complex64)
-                except ImportError:
+                if _zstd is None:
                     logger.warning("zstandard module not installed - cannot read .zst files")
-                except Exception as e:
-                    logger.error(f"Error reading {zst_path}: {e}")
+                else:
+                    try:
+                        if self._zstd_dctx is None:
+                            self._zstd_dctx = _zstd.ZstdDecompressor()
+                        with open(zst_path, 'rb') as f:
+                            _advise_sequential(f)
+                            with self._zstd_dctx.stream_reader(f) as reader:
+                                samples = _readinto_samples(reader, out)
+                    except Exception as e:
+                        logger.error(f"Error reading {zst_path}: {e}")
 
         # Try lz4 compressed .bin.lz4
         if samples is None:
             lz4_path = day_dir / f"{base_name}.bin.lz4"
             if lz4_path.exists():
-                try:
-                    import lz4.frame
-                    with open(lz4_path, 'rb') as f:
-                        data = lz4.frame.decompress(f.read())
-                        samples = np.frombuffer(data, dtype=np.complex64)
-                except ImportError:
+                if _lz4_frame is None:
                     logger.warning("lz4 module not installed - cannot read .lz4 files")
-                except Exception as e:
-                    logger.error(f"Error reading {lz4_path}: {e}")
+                else:
+                    try:
+                        samples = self._read_lz4(lz4_path, _lz4_frame.LZ4FrameDecompressor(), out)
+                    except Exception as e:
+                        logger.error(f"Error reading {lz4_path}: {e}")
         
         # 2. Read metadata
-        metadata = None
+        metadata = self._read_metadata(day_dir, base_name) if with_meta else None
+        
+        return samples, metadata
+
+    def _read_metadata(self, day_dir: Path, base_name: str) -> Optional[Dict]:
+        """
+        Read metadata for one minute.
+        
+        Uses the day's consolidated meta.jsonl when present, falling back to
+        the per-minute JSON sidecar (uncompacted days, or minutes written
+        after compaction). Returns None if absent/unreadable.
+        """
+        if day_dir.name not in self._day_meta:
+            self._day_meta[day_dir.name] = _load_day_meta(day_dir)
+        day_meta = self._day_meta[day_dir.name]
+        
+        if day_meta is not None:
+            metadata = day_meta.get(int(base_name))
+            if metadata is not None:
+                return metadata
+        
         json_path = day_dir / f"{base_name}.json"
         if json_path.exists():
             try:
-                with open(json_path, 'r') as f:
-                    metadata = json.load(f)
+                with open(json_path, 'rb') as f:
+                    return _json_loads(f.read())
             except Exception as e:
                 logger.warning(f"Error reading metadata {json_path}: {e}")
+        return None
+
+    def _advise_willneed(self, minute_timestamp: int, date_str: str):
+        """Ask the kernel to start reading a minute's file into the page cache."""
+        day_dir = self.archive_dir / date_str
         
-        return samples, metadata
+        for suffix in RAW_SUFFIXES:
+            try:
+                fd = os.open(day_dir / f"{minute_timestamp}{suffix}", os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+            return
+
+    def _read_lz4(self, path: Path, dctx, out: np.ndarray) -> np.ndarray:
+        """Decompress an lz4 frame file chunk-wise into a preallocated buffer."""
+        raw = out.view(np.uint8)
+        pos = 0
+        overflow = []
+        
+        with open(path, 'rb') as f:
+            _advise_sequential(f)
+            while True:
+                chunk = f.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                data = dctx.decompress(chunk)
+                n = min(len(data), len(raw) - pos)
+                raw[pos:pos + n] = np.frombuffer(data, dtype=np.uint8, count=n)
+                pos += n
+                if n < len(data):
+                    overflow.append(data[n:])
+        
+        if overflow:
+            return np.concatenate((out, np.frombuffer(b''.join(overflow), dtype=np.complex64)))
+        return raw[:pos].view(np.complex64)
 
-    def read_day(self, date_str: str) -> Generator[Tuple[int, Optional[np.ndarray], Optional[Dict]], None, None]:
+    def read_day(self, date_str: str,
+                 with_meta: bool = True) -> Generator[Tuple[int, Optional[np.ndarray], Optional[Dict]], None, None]:
         """
         Yield all available minutes for a day.
         
         Args:
             date_str: Date string (YYYYMMDD)
+            with_meta: Read per-minute metadata; False yields None for it and
+                       never touches the metadata files
             
         Yields:
             Tuple of (minute_timestamp, samples, metadata)
+            
+        Note:
+            samples is a view into a reused buffer; it is only valid until
+            the next item is requested. Copy it if it must outlive the
+            iteration step.
+            
+            The next minute is read/decompressed on a background thread while
+            the caller processes the current one (file I/O, zstd/lz4 and the
+            numpy copies release the GIL). Two buffers alternate: the one
+            yielded and the one being filled. Where supported, the kernel is
+            also asked to start reading the minute after that.
         """
+        if '-' in date_str:
+            date_str = date_str.replace('-', '')
+        
         minutes = self.get_available_minutes(date_str)
         logger.info(f"Found {len(minutes)} minutes for {date_str} in {self.channel_name}")
         
-        for minute_ts in minutes:
-            samples, meta = self.read_minute(minute_ts)
-            yield minute_ts, samples, meta
+        if not minutes:
+            return
+        
+        bufs = [np.empty(self.samples_per_minute, dtype=np.complex64) for _ in range(2)]
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending = prefetch.submit(self.read_minute, minutes[0], bufs[0], with_meta, date_str)
+            for i, minute_ts in enumerate(minutes):
+                samples, meta = pending.result()
+                if i + 1 < len(minutes):
+                    # Safe to refill: the caller is done with minute i - 1
+                    pending = prefetch.submit(
+                        self.read_minute, minutes[i + 1], bufs[(i + 1) % 2], with_meta, date_str
+                    )
+                if HAVE_FADVISE and i + 2 < len(minutes):
+                    prefetch.submit(self._advise_willneed, minutes[i + 2], date_str)
+                yield minute_ts, samples, meta
 
     def get_sample_rate(self, date_str: str) -> int:
         """
-        Estimate sample rate from the first available file.
+        Estimate sample rate from the first available file's metadata.
         Default to 24000 if cannot determine.
         """
-        minutes = self.get_available_minutes(date_str)
-        if not minutes:
-            return 24000
-            
-        _, meta = self.read_minute(minutes[0])
-        if meta and 'sample_rate' in meta:
-            return int(meta['sample_rate'])
+        if '-' in date_str:
+            date_str = date_str.replace('-', '')
+        
+        rate = self._rate_cache.get(date_str)
+        if rate is None:
+            minutes = self.get_available_minutes(date_str)
+            if not minutes:
+                return DEFAULT_SAMPLE_RATE
             
-        return 24000 
+            meta = self._read_metadata(self.archive_dir / date_str, str(minutes[0]))
+            if meta and 'sample_rate' in meta:
+                rate = int(meta['sample_rate'])
+            else:
+                rate = DEFAULT_SAMPLE_RATE
+            self._rate_cache[date_str] = rate
+        
+        self.samples_per_minute = rate * 60
+        return rate
+
+
+def _load_day_meta(day_dir: Path) -> Optional[Dict[int, Dict]]:
+    """Load a day's consolidated meta.jsonl as {minute_ts: metadata}, or None if absent."""
+    path = day_dir / DAY_META_FILE
+    try:
+        with open(path, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    
+    day_meta = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = _json_loads(line)
+            day_meta[int(record['minute'])] = record['meta']
+        except Exception as e:
+            logger.warning(f"Skipping bad line in {path}: {e}")
+    return day_meta
+
+
+def compact_day_metadata(day_dir: Path, delete: bool = True) -> int:
+    """
+    Fold a day's per-minute JSON sidecars into its meta.jsonl.
+    
+    Minutes already in meta.jsonl keep their existing entry. The file is
+    rewritten atomically (temp file + rename) before any sidecar is deleted.
+    
+    Args:
+        day_dir: Day directory (raw_archive/<channel>/<YYYYMMDD>)
+        delete: Remove the per-minute .json files once compacted
+        
+    Returns:
+        Number of sidecars folded in
+    """
+    day_dir = Path(day_dir)
+    day_meta = _load_day_meta(day_dir) or {}
+    
+    sidecars = []
+    with os.scandir(day_dir) as entries:
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            if ext == '.json' and stem.isdigit():
+                sidecars.append((int(stem), entry.path))
+    
+    if not sidecars:
+        return 0
+    
+    added = 0
+    for minute_ts, path in sorted(sidecars):
+        if minute_ts in day_meta:
+            continue
+        try:
+            with open(path, 'rb') as f:
+                day_meta[minute_ts] = _json_loads(f.read())
+            added += 1
+        except Exception as e:
+            logger.warning(f"Leaving unreadable metadata {path}: {e}")
+    
+    tmp_path = day_dir / f"{DAY_META_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for minute_ts in sorted(day_meta):
+            f.write(_json_dumps({'minute': minute_ts, 'meta': day_meta[minute_ts]}) + b'\n')
+    os.replace(tmp_path, day_dir / DAY_META_FILE)
+    
+    if delete:
+        for minute_ts, path in sidecars:
+            if minute_ts in day_meta:
+                os.unlink(path)
+    
+    logger.info(f"Compacted {added} metadata files into {day_dir / DAY_META_FILE}")
+    return added
+
+
+# CLI interface
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Compact per-minute raw metadata JSON into daily meta.jsonl files'
+    )
+    parser.add_argument('--data-root', type=Path, required=True,
+                       help='Root data directory')
+    parser.add_argument('--channel', type=str,
+                       help='Channel to compact (default: all)')
+    parser.add_argument('--date', type=str,
+                       help='Date to compact (YYYYMMDD or YYYY-MM-DD, default: all)')
+    parser.add_argument('--keep', action='store_true',
+                       help='Keep per-minute .json files after compaction')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    for subdir in ('raw_archive', 'raw_buffer'):
+        base = args.data_root / subdir
+        if not base.is_dir():
+            continue
+        for channel_dir in sorted(base.iterdir()):
+            if not channel_dir.is_dir():
+                continue
+            if args.channel and channel_dir.name != args.channel.replace(' ', '_'):
+                continue
+            for day_dir in sorted(channel_dir.iterdir()):
+                if args.date and day_dir.name != args.date.replace('-', ''):
+                    continue
+                if day_dir.is_dir():
+                    compact_day_metadata(day_dir, delete=not args.keep)
@@ -132,7 +132,10 @@ class SpectrogramGenerator:
             config: Spectrogram configuration
         """
         if not MPL_AVAILABLE:
-            raise ImportError("matplotlib required for spectrogram generation")
+            raise ImportError(
+                "matplotlib required for spectrogram generation. "
+                "Install with: pip install 'grape-recorder[plotting]'"
+            )
         if not SCIPY_AVAILABLE:
             raise ImportError("scipy required for spectrogram generation")
         
@@ -4,6 +4,7 @@ Upload manager module
 Handles reliable upload of processed datasets to remote repositories.
 """
 
+import shlex
 import subprocess
 import logging
 import time
@@ -14,6 +15,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone, timedelta
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Optional imports
 try:
@@ -24,6 +26,35 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# sftp transfer tuning (sftp -B / -R). OpenSSH's defaults are 32 KiB
+# requests with 64 outstanding. Larger requests cut round trips on
+# high-latency links. Clients only clamp -B to servers that advertise
+# limits@openssh.com (OpenSSH >= 8.6), so anything above SFTP_MAX_BLOCK_SIZE
+# fails with "Outbound message too long" against older servers; that value
+# is sftp-server's own write_length and fits every OpenSSH server.
+SFTP_MAX_BLOCK_SIZE = 261120
+DEFAULT_SFTP_MAX_REQUESTS = 64
+
+# Total upload rate cap (KB/s) when the config doesn't set one
+DEFAULT_BANDWIDTH_LIMIT_KBPS = 100
+
+
+def validate_sftp_block_size(block_size) -> int:
+    """
+    Check an sftp -B request size, clamping it to SFTP_MAX_BLOCK_SIZE.
+    
+    Raises:
+        ValueError: If block_size is not a positive integer
+    """
+    block_size = int(block_size)
+    if block_size <= 0:
+        raise ValueError(f"SFTP block size must be positive (got {block_size})")
+    if block_size > SFTP_MAX_BLOCK_SIZE:
+        logger.warning(f"SFTP block size {block_size} exceeds {SFTP_MAX_BLOCK_SIZE} "
+                       f"(larger requests fail on older OpenSSH servers); using {SFTP_MAX_BLOCK_SIZE}")
+        block_size = SFTP_MAX_BLOCK_SIZE
+    return block_size
+
 
 def load_upload_config_from_toml(toml_config: Dict, path_resolver=None) -> Dict:
     """
@@ -76,10 +107,14 @@ def load_upload_config_from_toml(toml_config: Dict, path_resolver=None) -> Dict:
         'host': proto_config.get('host', 'pswsnetwork.eng.ua.edu'),
         'user': proto_config.get('user', station.get('id', '')),
         'ssh': {
-            'key_file': ssh_key
+            'key_file': ssh_key,
+            'options': dict(proto_config.get('ssh_options', {}))
         },
         'bandwidth_limit_kbps': proto_config.get('bandwidth_limit_kbps', 
-                                                 proto_config.get('bandwidth_limit', 100)),
+                                                 proto_config.get('bandwidth_limit',
+                                                                  DEFAULT_BANDWIDTH_LIMIT_KBPS)),
+        'sftp_block_size': proto_config.get('block_size', SFTP_MAX_BLOCK_SIZE),
+        'sftp_max_requests': proto_config.get('max_requests', DEFAULT_SFTP_MAX_REQUESTS),
         'max_retries': uploader.get('max_retries', 5),
         'retry_backoff_base': 2 if uploader.get('exponential_backoff', True) else 1,
         'queue_file': queue_file
@@ -88,6 +123,20 @@ def load_upload_config_from_toml(toml_config: Dict, path_resolver=None) -> Dict:
     return config
 
 
+def _ssh_option_args(options: Dict) -> List[str]:
+    """
+    Build ssh/sftp '-o KEY=VALUE' arguments.
+    
+    Transport tuning (ciphers, IPQoS, HPN-SSH buffer settings, ...) is owned
+    by the OpenSSH client, so it is exposed as passthrough options rather
+    than set on a socket here.
+    """
+    args = []
+    for key, value in options.items():
+        args.extend(["-o", f"{key}={value}"])
+    return args
+
+
 @dataclass
 class UploadTask:
     """Represents an upload task in the queue"""
@@ -161,6 +210,7 @@ class SSHRsyncUpload(UploadProtocol):
         self.user = config['user']
         self.base_path = config.get('base_path', '/data/uploads')
         self.ssh_key = config.get('ssh', {}).get('key_file')
+        self.ssh_options = config.get('ssh', {}).get('options') or {}
         self.bandwidth_limit = config.get('bandwidth_limit')  # KB/s
         self.timeout = config.get('timeout', 3600)  # seconds
     
@@ -183,9 +233,13 @@ class SSHRsyncUpload(UploadProtocol):
         # Build rsync command
         cmd = ["rsync", "-avz", "--progress"]
         
-        # Add SSH key if specified
+        # Add SSH key and options if specified
+        ssh_cmd = ["ssh"]
         if self.ssh_key:
-            cmd.extend(["-e", f"ssh -i {self.ssh_key}"])
+            ssh_cmd.extend(["-i", str(self.ssh_key)])
+        ssh_cmd.extend(_ssh_option_args(self.ssh_options))
+        if len(ssh_cmd) > 1:
+            cmd.extend(["-e", shlex.join(ssh_cmd)])
         
         # Add bandwidth limit if specified
         if self.bandwidth_limit:
@@ -244,6 +298,7 @@ class SSHRsyncUpload(UploadProtocol):
         
         if self.ssh_key:
             cmd.extend(["-i", self.ssh_key])
+        cmd.extend(_ssh_option_args(self.ssh_options))
         
         cmd.extend([
             f"{self.user}@{self.host}",
@@ -275,13 +330,22 @@ class SFTPUpload(UploadProtocol):
                 - host: PSWS server hostname
                 - user: PSWS station ID (e.g., 'S000171')
                 - ssh.key_file: Path to SSH private key
+                - ssh.options: Extra ssh_config options passed as -o KEY=VALUE
                 - bandwidth_limit_kbps: Upload bandwidth limit (default: 100)
+                - sftp_block_size: Bytes per SFTP write request (default and
+                  maximum: 261120; larger values are clamped)
+                - sftp_max_requests: Outstanding SFTP requests (default: 64)
                 - psws_server_url: PSWS server URL (default from config['host'])
         """
         self.host = config['host']
         self.user = config['user']  # PSWS station ID
         self.ssh_key = config.get('ssh', {}).get('key_file')
-        self.bandwidth_limit_kbps = config.get('bandwidth_limit_kbps', 100)
+        self.ssh_options = config.get('ssh', {}).get('options') or {}
+        self.bandwidth_limit_kbps = config.get('bandwidth_limit_kbps', DEFAULT_BANDWIDTH_LIMIT_KBPS)
+        self.block_size = validate_sftp_block_size(
+            config.get('sftp_block_size', SFTP_MAX_BLOCK_SIZE)
+        )
+        self.max_requests = config.get('sftp_max_requests', DEFAULT_SFTP_MAX_REQUESTS)
         self.psws_server_url = config.get('psws_server_url', self.host)
     
     def upload(self, local_path: Path, remote_path: str, metadata: Dict) -> bool:
@@ -328,10 +392,15 @@ class SFTPUpload(UploadProtocol):
             # Add SSH key if specified
             if self.ssh_key:
                 cmd.extend(["-i", str(self.ssh_key)])
+            cmd.extend(_ssh_option_args(self.ssh_options))
             
             # Add bandwidth limit
             cmd.extend(["-l", str(self.bandwidth_limit_kbps)])
             
+            # Request size and pipelining depth
+            cmd.extend(["-B", str(self.block_size)])
+            cmd.extend(["-R", str(self.max_requests)])
+            
             # Add batch file
             cmd.extend(["-b", sftp_cmds_file])
             
@@ -416,19 +485,35 @@ class UploadManager:
         self.queue: List[UploadTask] = []
         
         # Init protocol
-        self.protocol = self._init_protocol(config)
+        self.protocol = self._create_protocol()
         
         # Load queue from disk
         self._load_queue()
     
-    def _create_protocol(self) -> UploadProtocol:
-        """Create upload protocol instance"""
-        protocol_type = self.config.get('protocol', 'sftp')  # Default to SFTP for PSWS
+    def _create_protocol(self, workers: int = 1) -> UploadProtocol:
+        """
+        Create upload protocol instance
+        
+        Args:
+            workers: Uploads that will run concurrently with this instance.
+                Each runs its own rate-limited sftp/rsync process, so the
+                configured bandwidth cap is split evenly between them.
+        """
+        config = self.config
+        if workers > 1:
+            config = dict(config)
+            config['bandwidth_limit_kbps'] = max(
+                1, config.get('bandwidth_limit_kbps', DEFAULT_BANDWIDTH_LIMIT_KBPS) // workers
+            )
+            if config.get('bandwidth_limit'):
+                config['bandwidth_limit'] = max(1, config['bandwidth_limit'] // workers)
+        
+        protocol_type = config.get('protocol', 'sftp')  # Default to SFTP for PSWS
         
         if protocol_type == 'ssh_rsync':
-            return SSHRsyncUpload(self.config)
+            return SSHRsyncUpload(config)
         elif protocol_type == 'sftp':
-            return SFTPUpload(self.config)
+            return SFTPUpload(config)
         else:
             raise ValueError(f"Unknown upload protocol: {protocol_type}")
     
@@ -620,14 +705,23 @@ class UploadManager:
         logger.info(f"   Date: {date}")
         logger.info(f"   Remote: {remote_path}")
     
-    def process_queue(self):
-        """Process upload queue with retry logic"""
+    def process_queue(self, max_workers: int = 1):
+        """
+        Process upload queue with retry logic
+        
+        Args:
+            max_workers: Number of uploads to run concurrently. Each upload
+                runs its own sftp/rsync process (and SSH connection), which
+                helps on high-latency links; the configured bandwidth limit
+                is shared between them, so the total stays under it.
+        """
         if not self.queue:
             logger.debug("Upload queue is empty")
             return
         
         logger.info(f"Processing upload queue ({len(self.queue)} tasks)")
         
+        ready = []
         for task in self.queue[:]:  # Iterate over copy
             if task.status == "completed":
                 continue
@@ -649,17 +743,33 @@ class UploadManager:
                     logger.debug(f"Waiting {wait_time - elapsed:.0f}s before retry for {task.dataset_path}")
                     continue
             
-            # Attempt upload
-            self._attempt_upload(task)
-            self._save_queue()
+            ready.append(task)
+        
+        if max_workers <= 1 or len(ready) <= 1:
+            for task in ready:
+                self._attempt_upload(task)
+                self._save_queue()
+            return
+        
+        # Tasks touch only their own fields; the queue file is written from
+        # this thread as each upload finishes.
+        logger.info(f"Uploading {len(ready)} tasks with {max_workers} workers")
+        protocol = self._create_protocol(workers=min(max_workers, len(ready)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self._attempt_upload, task, protocol) for task in ready]
+            for future in as_completed(futures):
+                future.result()
+                self._save_queue()
     
-    def _attempt_upload(self, task: UploadTask):
+    def _attempt_upload(self, task: UploadTask, protocol: Optional[UploadProtocol] = None):
         """
         Attempt to upload a task
         
         Args:
             task: UploadTask to upload
+            protocol: Protocol to use (default: self.protocol)
         """
+        protocol = protocol or self.protocol
         task.status = "uploading"
         task.attempts += 1
         task.last_attempt = datetime.now(timezone.utc).isoformat()
@@ -676,11 +786,11 @@ class UploadManager:
                 return
             
             # Perform upload
-            success = self.protocol.upload(dataset_path, task.remote_path, task.metadata)
+            success = protocol.upload(dataset_path, task.remote_path, task.metadata)
             
             if success:
                 # Verify upload
-                if self.protocol.verify(task.remote_path):
+                if protocol.verify(task.remote_path):
                     logger.info(f"✅ Upload verified: {task.dataset_path}")
                     task.status = "completed"
                     task.completed_at = datetime.now(timezone.utc).isoformat()
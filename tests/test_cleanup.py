@@ -73,6 +73,31 @@ def test_cleanup():
         
         # Check unrelated files preserved (optional)
         
+
+def test_cleanup_python_fallback(monkeypatch):
+    """Dataset is still emptied when `rm` cannot be run."""
+    import subprocess
+    from grape_recorder.cli import _remove_dataset_contents
+    
+    def no_rm(*args, **kwargs):
+        raise FileNotFoundError("rm")
+    monkeypatch.setattr(subprocess, 'run', no_rm)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        obs_dir = Path(tmpdir) / "OBS2025-12-18T00-00"
+        hour_dir = obs_dir / "ch0" / "2025-12-18T00-00-00"
+        hour_dir.mkdir(parents=True)
+        for i in range(5):
+            (hour_dir / f"rf@1766016000.{i:03d}.h5").write_text("data")
+        (obs_dir / "ch0" / "drf_properties.h5").write_text("metadata")
+        (obs_dir / "ch0" / "link").symlink_to(hour_dir)
+        token_file = obs_dir / ".upload_complete"
+        token_file.write_text("complete")
+        
+        _remove_dataset_contents(obs_dir, keep='.upload_complete')
+        
+        assert [p.name for p in obs_dir.iterdir()] == ['.upload_complete']
+        
 if __name__ == "__main__":
     try:
         test_cleanup()
@@ -0,0 +1,34 @@
+"""
+DecimatedBuffer: block writes land at the right offsets with per-minute metadata.
+"""
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from grape_recorder.core.decimated_buffer import DecimatedBuffer, SAMPLES_PER_MINUTE
+
+
+def test_write_minutes_matches_write_minute():
+    start = datetime(2025, 12, 14, 1, 30, tzinfo=timezone.utc).timestamp()
+    rng = np.random.default_rng(0)
+    block = (rng.standard_normal((3, SAMPLES_PER_MINUTE)) +
+             1j * rng.standard_normal((3, SAMPLES_PER_MINUTE))).astype(np.complex64)
+    metas = [{'d_clock_ms': 0.5 * i, 'quality_grade': 'ABC'[i]} for i in range(3)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        single = DecimatedBuffer(Path(tmpdir) / 'a', 'WWV 10 MHz')
+        for i in range(3):
+            assert single.write_minute(start + 60 * i, block[i], **metas[i])
+
+        batched = DecimatedBuffer(Path(tmpdir) / 'b', 'WWV 10 MHz')
+        assert batched.write_minutes(start, block, metas)
+
+        iq_a, meta_a = single.read_day('20251214')
+        iq_b, meta_b = batched.read_day('20251214')
+
+        np.testing.assert_array_equal(iq_a, iq_b)
+        np.testing.assert_array_equal(iq_b[90 * SAMPLES_PER_MINUTE:93 * SAMPLES_PER_MINUTE], block.ravel())
+        assert meta_a.minutes == meta_b.minutes
+        assert meta_b.minutes['91']['quality_grade'] == 'B'
@@ -0,0 +1,87 @@
+"""
+RawBinaryReader: raw and compressed minute files decode to the same samples.
+"""
+import json
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from grape_recorder.core.raw_reader import RawBinaryReader, compact_day_metadata
+
+DATE_STR = '20251214'
+CHANNEL = 'WWV 10 MHz'
+SAMPLE_RATE = 20000
+
+
+def minute_ts(i: int) -> int:
+    start = datetime.strptime(DATE_STR, '%Y%m%d').replace(tzinfo=timezone.utc)
+    return int(start.timestamp()) + i * 60
+
+
+def make_samples(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(n) + 1j * rng.standard_normal(n)).astype(np.complex64)
+
+
+def write_minute(day_dir: Path, ts: int, samples: np.ndarray, suffix: str = '.bin'):
+    data = samples.tobytes()
+    if suffix == '.bin.zst':
+        zstd = pytest.importorskip('zstandard')
+        data = zstd.ZstdCompressor().compress(data)
+    elif suffix == '.bin.lz4':
+        lz4_frame = pytest.importorskip('lz4.frame')
+        data = lz4_frame.compress(data)
+    (day_dir / f"{ts}{suffix}").write_bytes(data)
+    (day_dir / f"{ts}.json").write_text(json.dumps({'sample_rate': SAMPLE_RATE}))
+
+
+@pytest.mark.parametrize('suffix', ['.bin', '.bin.zst', '.bin.lz4'])
+def test_read_day_roundtrip(suffix):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        day_dir = root / 'raw_archive' / CHANNEL.replace(' ', '_') / DATE_STR
+        day_dir.mkdir(parents=True)
+
+        # Full minute, short minute, and a minute longer than expected
+        lengths = [SAMPLE_RATE * 60, SAMPLE_RATE * 45, SAMPLE_RATE * 60 + 100]
+        expected = {}
+        for i, n in enumerate(lengths):
+            samples = make_samples(n, seed=i)
+            write_minute(day_dir, minute_ts(i), samples, suffix)
+            expected[minute_ts(i)] = samples
+
+        reader = RawBinaryReader(root, CHANNEL)
+        assert reader.get_sample_rate(DATE_STR) == SAMPLE_RATE
+        assert reader.get_available_minutes(DATE_STR) == sorted(expected)
+
+        seen = 0
+        for ts, samples, meta in reader.read_day(DATE_STR):
+            np.testing.assert_array_equal(samples, expected[ts])
+            assert meta == {'sample_rate': SAMPLE_RATE}
+            seen += 1
+        assert seen == len(lengths)
+
+
+def test_compacted_metadata():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        day_dir = root / 'raw_archive' / CHANNEL.replace(' ', '_') / DATE_STR
+        day_dir.mkdir(parents=True)
+
+        for i in range(3):
+            write_minute(day_dir, minute_ts(i), make_samples(SAMPLE_RATE, seed=i))
+            (day_dir / f"{minute_ts(i)}.json").write_text(json.dumps({'sample_rate': SAMPLE_RATE, 'i': i}))
+
+        assert compact_day_metadata(day_dir) == 3
+        assert not list(day_dir.glob('*.json'))
+
+        # A minute arriving after compaction still has its own sidecar
+        write_minute(day_dir, minute_ts(3), make_samples(SAMPLE_RATE, seed=3))
+
+        reader = RawBinaryReader(root, CHANNEL)
+        metas = [meta for _, _, meta in reader.read_day(DATE_STR)]
+        assert metas[:3] == [{'sample_rate': SAMPLE_RATE, 'i': i} for i in range(3)]
+        assert metas[3] == {'sample_rate': SAMPLE_RATE}